@@ -1,11 +1,33 @@
+import asyncio
+import json
+import os
+import threading
 import time
+import re
 import gspread
-from fastapi import FastAPI, HTTPException, Query
+import orjson
+from gspread.utils import absolute_range_name, rowcol_to_a1
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from google.auth.exceptions import GoogleAuthError
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2.service_account import Credentials
+from requests import RequestException
+from requests.adapters import HTTPAdapter
 from pydantic import BaseModel
 from typing import Optional
-import re
+from cachetools import TTLCache
+
+try:  # optional: only needed for a cache shared across uvicorn workers
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:
+    aioredis = None
+    RedisError = OSError
+from contextlib import asynccontextmanager
+from functools import cached_property
 
 # ======================================================
 # Python libs
@@ -17,7 +39,15 @@ import numpy as np
 # ======================================================
 # APP SETUP
 # ======================================================
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fail fast on a missing/invalid key file, not on the first request
+    init_client()
+    yield
+
+
+# orjson: much faster than stdlib json for big /column payloads
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # CORS — allows your HTML frontend to call this API
 # (equivalent to GAS allowing access to "Anyone")
@@ -26,44 +56,275 @@ app.add_middleware(
     allow_origins=["*"],  # In production, replace * with your GitHub Pages URL
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Response-Time-ms"],  # let app.js read the timing header
 )
 
+
+# ======================================================
+# MIDDLEWARE — response timing
+# Equivalent to timed_() in GAS
+# ======================================================
+# Backend time goes in a header, so endpoints return their dict untouched
+# (and cached/pre-serialized bodies never need re-encoding).
+@app.middleware("http")
+async def add_timing(request, call_next):
+    t0 = time.perf_counter()
+    resp = await call_next(request)
+    resp.headers["X-Response-Time-ms"] = str(int((time.perf_counter() - t0) * 1000))
+    return resp
+
 # ======================================================
 # GOOGLE SHEETS AUTH
 # ======================================================
 # Equivalent to GAS having automatic Google auth built-in.
 # You need to set up credentials.json once.
+# Optional shared response cache (see CACHE section below)
+REDIS_URL = os.getenv("REDIS_URL")
+SHARED_CACHE_ENABLED = bool(aioredis and REDIS_URL)
+
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+if SHARED_CACHE_ENABLED:
+    # Drive modifiedTime is only needed to version the shared cache
+    SCOPES.append("https://www.googleapis.com/auth/drive.metadata.readonly")
+SERVICE_ACCOUNT_FILE = "fastapi-test-487717-8a13c51d706e.json"
+
+# Keep-alive pool for the Sheets HTTPS connections. Sized above the
+# default 10 so concurrent threadpool requests don't drop/re-open sockets.
+HTTP_POOL_SIZE = 20
+
+
+def build_client(creds: Credentials) -> gspread.Client:
+    """gspread client on one pooled session — TLS handshakes are paid once
+    per connection instead of once per call."""
+    session = AuthorizedSession(creds)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    return gspread.authorize(creds, session=session)
+
+
+# Authorize once per process — every request reuses the same client
+# instead of re-reading the key file and re-doing the JWT exchange.
+_creds: Optional[Credentials] = None
+_client: Optional[gspread.Client] = None
+
+
+def init_client() -> gspread.Client:
+    """Load the key file into memory once, build credentials from the dict,
+    and authorize. Later calls return the same client."""
+    global _creds, _client
+    if _client is None:
+        with open(SERVICE_ACCOUNT_FILE) as f:
+            sa_info = json.load(f)
+        _creds = Credentials.from_service_account_info(sa_info, scopes=SCOPES)
+        _client = build_client(_creds)
+    return _client
+
+
+# Opened worksheets, keyed by sheet_id: {sheet_id: (ws, expires_at)}
+# Entries expire so a re-shared / re-ordered spreadsheet is picked up again.
+WS_CACHE_TTL_S = 600
+WS_CACHE_MAXSIZE = 128
+_ws_cache: dict[str, tuple[gspread.Worksheet, float]] = {}
+_ws_lock = threading.Lock()  # endpoints run in a threadpool
+
 
 def get_sheet(sheet_id: str):
     """Open a Google Sheet by ID — equivalent to SpreadsheetApp.openById()"""
-    creds = Credentials.from_service_account_file("fastapi-test-487717-8a13c51d706e.json", scopes=SCOPES)
-    client = gspread.authorize(creds)
-    ss = client.open_by_key(sheet_id)
-    return ss.get_worksheet(0)  # First sheet, same as ss.getSheets()[0]
+    now = time.monotonic()  # immune to wall-clock/NTP jumps
+    with _ws_lock:
+        hit = _ws_cache.get(sheet_id)
+    if hit is not None and hit[1] > now:
+        return hit[0]
+
+    ss = init_client().open_by_key(sheet_id)
+    ws = ss.get_worksheet(0)  # First sheet, same as ss.getSheets()[0]
+
+    with _ws_lock:
+        if len(_ws_cache) >= WS_CACHE_MAXSIZE:
+            # Drop expired entries first, then the oldest one if still full
+            for k in [k for k, (_, exp) in _ws_cache.items() if exp <= now]:
+                del _ws_cache[k]
+            if len(_ws_cache) >= WS_CACHE_MAXSIZE:
+                del _ws_cache[next(iter(_ws_cache))]
+        _ws_cache[sheet_id] = (ws, now + WS_CACHE_TTL_S)
+    return ws
 
 
 # ======================================================
-# HELPER — timing wrapper
-# Equivalent to timed_() in GAS
+# CACHE — short-lived response cache for read endpoints
+# Equivalent to CacheService in GAS
+# ======================================================
+# The UI re-asks /bounds and /column for the same sheet a lot; serve those
+# from memory for a few seconds. Write endpoints invalidate the sheet.
+RESPONSE_CACHE_TTL_S = 10
+# Keys start with sheet_id; with Redis on they end with the sheet's modifiedTime.
+_bounds_cache: TTLCache = TTLCache(maxsize=512, ttl=RESPONSE_CACHE_TTL_S)   # (sheet_id,) -> dict
+_column_cache: TTLCache = TTLCache(maxsize=512, ttl=RESPONSE_CACHE_TTL_S)   # (sheet_id, col) -> dict
+_cache_lock = threading.Lock()
+# Bumped on every write to a sheet; a read that started before the write
+# must not store its (pre-write) result afterwards.
+_sheet_gen: dict[str, int] = {}
+
+
+def cached_response(cache: TTLCache, key, fn) -> dict:
+    """Return cache[key], computing and storing fn() on a miss.
+    key[0] is the sheet_id."""
+    with _cache_lock:
+        hit = cache.get(key)
+        gen = _sheet_gen.get(key[0], 0)
+    if hit is None:
+        hit = fn()
+        with _cache_lock:
+            if _sheet_gen.get(key[0], 0) == gen:
+                cache[key] = hit
+    return hit
+
+
+def invalidate_sheet_cache(sheet_id: str) -> None:
+    with _cache_lock:
+        _sheet_gen[sheet_id] = _sheet_gen.get(sheet_id, 0) + 1
+        for cache in (_bounds_cache, _column_cache):
+            for key in [k for k in cache.keys() if k[0] == sheet_id]:
+                cache.pop(key, None)
+        _mtime_cache.pop(sheet_id, None)
+
+
+# ======================================================
+# CACHE — optional shared (Redis) cache for multi-worker deployments
 # ======================================================
-def timed(fn):
-    t0 = time.time()
-    result = fn()
-    ms = int((time.time() - t0) * 1000)
-    result["ms"] = ms
+# The in-memory caches above are per worker. With REDIS_URL set, /bounds and
+# /column responses are also stored in Redis, keyed by the spreadsheet's Drive
+# modifiedTime — any edit changes the key, so no explicit invalidation needed.
+REDIS_CACHE_TTL_S = 300
+MTIME_CACHE_TTL_S = 5
+MTIME_FAILURE_TTL_S = 60
+_redis = aioredis.Redis.from_url(REDIS_URL) if SHARED_CACHE_ENABLED else None
+_mtime_cache: TTLCache = TTLCache(maxsize=512, ttl=MTIME_CACHE_TTL_S)   # sheet_id -> modifiedTime
+_mtime_failed: TTLCache = TTLCache(maxsize=512, ttl=MTIME_FAILURE_TTL_S)   # sheet_id -> True
+
+
+def modified_time(sheet_id: str) -> Optional[str]:
+    """Drive modifiedTime of the spreadsheet (files.get, cached a few seconds),
+    or None if Drive can't tell us. Failures are cached too, so e.g. a disabled
+    Drive API doesn't cost a failing round-trip on every request."""
+    with _cache_lock:
+        if sheet_id in _mtime_failed:
+            return None
+        hit = _mtime_cache.get(sheet_id)
+    if hit is not None:
+        return hit
+
+    try:
+        hit = init_client().get_file_drive_metadata(sheet_id)["modifiedTime"]
+    except (gspread.exceptions.APIError, RequestException, GoogleAuthError, KeyError):
+        with _cache_lock:
+            _mtime_failed[sheet_id] = True
+        return None
+    with _cache_lock:
+        _mtime_cache[sheet_id] = hit
+    return hit
+
+
+# ======================================================
+# HELPER — coalesce identical in-flight reads
+# ======================================================
+# The UI often fires the same read several times at once (e.g. /bounds
+# from two panels). Only the first caller hits Sheets; the rest await it.
+# Keys are (endpoint, sheet_id, ...).
+_inflight: dict[tuple, asyncio.Future] = {}
+
+
+async def coalesced(key: tuple, fn) -> dict:
+    """Run fn() in a worker thread, sharing one run between concurrent
+    callers with the same key."""
+    fut = _inflight.get(key)
+    if fut is None:
+        fut = asyncio.ensure_future(run_in_threadpool(fn))
+        _inflight[key] = fut
+        # Only drop our own entry — a write may already have replaced it
+        fut.add_done_callback(lambda f: _inflight.pop(key) if _inflight.get(key) is f else None)
+    # shield: one client disconnecting must not cancel the others' read
+    return await asyncio.shield(fut)
+
+
+def forget_inflight(sheet_id: str) -> None:
+    """Called after a write: reads already in flight for this sheet may hold
+    pre-write data, so later callers must start a fresh read instead."""
+    for key in [k for k in _inflight if k[1] == sheet_id]:
+        del _inflight[key]
+
+
+# ======================================================
+# HELPER — cached read path for /bounds and /column
+# ======================================================
+async def cached_read(name: str, cache: TTLCache, key: tuple, load) -> dict:
+    """Redis (if enabled) -> per-worker TTL cache -> coalesced Sheets read.
+    key[0] is the sheet_id. With Redis on, modifiedTime is fetched *before*
+    reading and appended to every key, so a result is never stored under a
+    newer version than the data it was read from."""
+    # No version (Redis off, or Drive lookup failed) -> per-worker path only
+    version = await run_in_threadpool(modified_time, key[0]) if _redis is not None else None
+    if version is not None:
+        key = (*key, version)
+        redis_key = ":".join((name, *map(str, key)))
+        try:
+            hit = await _redis.get(redis_key)
+        except RedisError:
+            hit = None  # cache trouble must never fail the request
+        if hit is not None:
+            # Already-serialized JSON: skip re-encoding
+            return Response(content=hit, media_type="application/json")
+
+    result = await coalesced((name, *key), lambda: cached_response(cache, key, load))
+
+    if version is not None:
+        try:
+            await _redis.set(redis_key, orjson.dumps(result), ex=REDIS_CACHE_TTL_S)
+        except RedisError:
+            pass
     return result
 
 
+# ======================================================
+# HELPER — read several ranges in one round-trip
+# Equivalent to Sheets.Spreadsheets.Values.batchGet() in GAS
+# ======================================================
+def batch_get_values(ws, ranges: list[str], major_dimension: Optional[str] = None) -> list[list[list[str]]]:
+    """Fetch several A1 ranges of `ws` with a single values.batchGet call
+    ("" = the whole sheet).
+    Returns one list[list[str]] per range (empty list if the range is blank)."""
+    params = {"majorDimension": major_dimension} if major_dimension else None
+    resp = ws.spreadsheet.values_batch_get(
+        ranges=[absolute_range_name(ws.title, r) for r in ranges],
+        params=params,
+    )
+    return [vr.get("values", []) for vr in resp.get("valueRanges", [])]
+
+
+def exceeds_grid(err: gspread.exceptions.APIError) -> bool:
+    """True for Sheets' 400 "Range (...) exceeds grid limits" error."""
+    return err.code == 400 and "exceeds grid limits" in str(err)
+
+
+def first_value(values: list[list[str]]) -> str:
+    """Top-left value of a batch_get_values() range, or "" if blank."""
+    return values[0][0] if values and values[0] else ""
+
 
 # ======================================================
 # HELPER — column letter to index
 # Equivalent to colToIndexAZ_() in GAS
 # ======================================================
+def is_col_letter(col: str) -> bool:
+    # Plain ASCII character check — cheaper than a regex on every request.
+    # Check the raw char: .upper() maps e.g. "ß" -> "SS" and "ı" -> "I".
+    return len(col) == 1 and ("A" <= col <= "Z" or "a" <= col <= "z")
+
+
 def col_to_index(col: str) -> int:
-    col = col.upper()
-    if not re.match(r'^[A-Z]$', col):
+    if not is_col_letter(col):
         raise HTTPException(status_code=400, detail=f"Invalid col (A-Z only): {col}")
+    col = col.upper()
     return ord(col) - ord('A') + 1  # A=1, B=2, etc.
 
 
@@ -85,53 +346,55 @@ def classify(v) -> str:
 # HELPER — smart parse string to correct type
 # Equivalent to smartParse_() in GAS
 # ======================================================
+_BOOL_SET = frozenset(("true", "false"))
+_INT_RE = re.compile(r"[+-]?\d+")
+_FLOAT_RE = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+
+
 def smart_parse(raw: str):
-    s = str(raw).strip()
+    s = (raw if isinstance(raw, str) else str(raw)).strip()
     if not s:
         return ""
-    if s.lower() in ("true", "false"):
-        return s.lower() == "true"
-    try:
+    low = s.lower()
+    if low in _BOOL_SET:
+        return low == "true"
+    # Pattern checks first, so plain text never goes through raise/except
+    if _INT_RE.fullmatch(s):
         return int(s)
-    except ValueError:
-        pass
-    try:
+    if _FLOAT_RE.fullmatch(s):
         return float(s)
-    except ValueError:
-        pass
     return s
 
 
-
 class SheetOps:
     """
     A lightweight wrapper around a Google Sheet (first worksheet),
-    providing a DataFrame view + common operations.
+    providing a row/column view + common operations.
     """
 
     def __init__(self, sheet_id: str):
-        # API request 1-1: "Load sheet" (initialize)
+        # Cheap: only opens the (cached) worksheet. The sheet values are
+        # pulled lazily, the first time an operation actually needs them.
         self.sheet_id = sheet_id
         self.ws = get_sheet(sheet_id)  # gspread Worksheet
-        self.headers: list[str] = []
-        self.df: pd.DataFrame = self._load_df()
 
     # -------------------------
-    # Internal helpers
+    # Lazy sheet views
     # -------------------------
-    def _load_df(self) -> pd.DataFrame:
-        # Pull all values as list[list[str]]
-        vals = self.ws.get_all_values()
-
-        if not vals:
-            self.headers = []
-            return pd.DataFrame()
+    @cached_property
+    def values(self) -> list[list[str]]:
+        # API request 1-1: "Load sheet" — all values as list[list[str]]
+        return self.ws.get_all_values()
 
+    @cached_property
+    def headers(self) -> list[str]:
         # Header row (row 1)
-        self.headers = [str(h).strip() for h in vals[0]]
+        return [str(h).strip() for h in self.values[0]] if self.values else []
 
+    @cached_property
+    def rows(self) -> list[list[str]]:
         # Data rows (row 2..)
-        rows = vals[1:] if len(vals) > 1 else []
+        rows = self.values[1:] if len(self.values) > 1 else []
 
         # Ensure each row has same length as headers (pad/truncate)
         ncol = len(self.headers)
@@ -144,7 +407,34 @@ class SheetOps:
                 r = r[:ncol]
             norm_rows.append(r)
 
-        return pd.DataFrame(norm_rows, columns=self.headers)
+        return norm_rows
+
+    @cached_property
+    def df(self) -> pd.DataFrame:
+        # DataFrame view, only built for the operations that need pandas
+        return pd.DataFrame(self.rows, columns=self.headers)
+
+    # -------------------------
+    # Internal helpers
+    # -------------------------
+    def _header_letter(self, name: str) -> str:
+        """Header name -> column letter, looked up in row 1 only
+        (cheaper than self.headers, which loads the whole sheet)."""
+        header_row = [str(h).strip() for h in self.ws.row_values(1)]
+        if name not in header_row:
+            raise HTTPException(status_code=400, detail=f"Invalid column: {name}. Use A-Z or a header name.")
+        # "AD1" -> "AD": works past Z, unlike chr(ord("A") + i)
+        return rowcol_to_a1(1, header_row.index(name) + 1)[:-1]
+
+    def _get_in_grid(self, ranges: list[str], col: str, **kwargs) -> list[list[list[str]]]:
+        """batch_get_values(), but a range past the sheet's grid is a 400
+        "out of range" for `col` instead of a Sheets APIError (500)."""
+        try:
+            return batch_get_values(self.ws, ranges, **kwargs)
+        except gspread.exceptions.APIError as e:
+            if not exceeds_grid(e):
+                raise
+            raise HTTPException(status_code=400, detail=f"Column {col} out of range.")
 
     def _col_to_zero_based(self, col: str) -> int:
         """
@@ -157,7 +447,7 @@ class SheetOps:
         c = (col or "").strip()
 
         # A..Z
-        if re.fullmatch(r"[A-Za-z]", c):
+        if is_col_letter(c):
             idx = ord(c.upper()) - ord("A")
             if idx < 0 or idx >= len(self.headers):
                 raise HTTPException(status_code=400, detail=f"Column {col} out of range.")
@@ -169,44 +459,33 @@ class SheetOps:
 
         raise HTTPException(status_code=400, detail=f"Invalid column: {col}. Use A-Z or a header name.")
 
-    def _actual_last_row_col(self) -> tuple[int, int]:
+    @staticmethod
+    def _actual_last_row_col(columns: list[list[str]]) -> tuple[int, int]:
         """
         Compute "actual" last row/col that contains any non-empty cell.
+        Input:
+          - columns: sheet values in column order (majorDimension=COLUMNS),
+            row 1 = header row
         Return:
-          (last_row, last_col) as 1-based counts excluding header for row logic:
-          - last_row includes header row? Here we report lastRow INCLUDING header row indexing style?
-            We'll report lastRow in spreadsheet row numbering (1 = header row).
+          (last_row, last_col) in spreadsheet numbering (1 = header row / col A)
         """
-        if self.df.empty:
-            # Only header row exists? Actually df empty means no data rows
-            last_row = 1 if self.headers else 0
-            last_col = len(self.headers)
-            return last_row, last_col
-
-        # Identify non-empty cells in df (strings)
-        non_empty = self.df.astype(str).apply(lambda col: col.str.strip().ne(""), axis=0)
-
-        # Last data row (0-based in df) that has any non-empty
-        rows_any = non_empty.any(axis=1)
-        if rows_any.any():
-            last_data_row0 = rows_any[rows_any].index.max()
-            # Spreadsheet row number = header row (1) + data_row_index (0-based) + 1
-            last_row = 2 + int(last_data_row0)
-        else:
-            last_row = 1  # header only
-
-        # Last col (0-based) that has any non-empty in header or data
-        # Use header row too, because headers define "used columns" for your UI.
-        header_any = [bool(str(h).strip()) for h in self.headers]
-        cols_any = non_empty.any(axis=0).tolist()
-        combined = [ha or ca for ha, ca in zip(header_any, cols_any)] if self.headers else cols_any
-
+        def last_non_empty(cells: list[str]) -> int:
+            # Scan bottom-up and stop at the first hit
+            for i in range(len(cells) - 1, -1, -1):
+                if str(cells[i]).strip():
+                    return i + 1  # 1-based
+            return 0
+
+        last_row = 0
         last_col = 0
-        for j in range(len(combined) - 1, -1, -1):
-            if combined[j]:
-                last_col = j + 1  # 1-based count
-                break
-
+        for j, cells in enumerate(columns):
+            n = last_non_empty(cells)
+            if n:
+                last_col = j + 1  # header or data in this column
+                last_row = max(last_row, n)
+
+        if columns:
+            last_row = max(last_row, 1)  # header row always counts
         return last_row, last_col
 
     # -------------------------
@@ -215,11 +494,16 @@ class SheetOps:
 
     def bounds(self) -> dict:
         # API request 1-2: ask for bounds
-        last_row, last_col = self._actual_last_row_col()
+        # One batchGet of the used range in column order: columns come back
+        # already trimmed, and the last-row scan stops early per column.
+        (columns,) = batch_get_values(self.ws, [""], major_dimension="COLUMNS")
+        headers = [str(c[0]).strip() if c else "" for c in columns]
+
+        last_row, last_col = self._actual_last_row_col(columns)
         return {
             "lastRow": last_row,
             "lastCol": last_col,
-            "headers": self.headers
+            "headers": headers
         }
 
     def add_cols(self, colA: str = "A", colB: str = "B", outCol: str = "C", outHeader: str = "sum") -> dict:
@@ -231,20 +515,20 @@ class SheetOps:
         # Convert to numeric safely; non-numeric -> NaN -> treat as 0
         a = pd.to_numeric(self.df.iloc[:, a_idx], errors="coerce").fillna(0.0)
         b = pd.to_numeric(self.df.iloc[:, b_idx], errors="coerce").fillna(0.0)
-        s = (a + b)
 
-        # Write header (row 1) for output column
-        self.ws.update_cell(1, o_idx + 1, outHeader)
-
-        # Prepare values for writing back starting at row 2
-        out_vals = [[float(x)] for x in s.tolist()]  # list-of-lists for gspread
+        # Prepare values for writing back starting at row 2:
+        # one vector add in NumPy, reshaped to a column (list-of-lists for gspread)
+        out_vals = (a.to_numpy(dtype=np.float64) + b.to_numpy(dtype=np.float64)).reshape(-1, 1).tolist()
 
+        # Header (row 1) + values in ONE values.batchUpdate call.
+        # RAW: skip server-side formula/format parsing
+        col_letter = chr(ord("A") + o_idx)
+        data = [{"range": f"{col_letter}1", "values": [[outHeader]]}]
         if out_vals:
             start_row = 2
             end_row = start_row + len(out_vals) - 1
-            col_letter = chr(ord("A") + o_idx)
-            rng = f"{col_letter}{start_row}:{col_letter}{end_row}"
-            self.ws.update(rng, out_vals)
+            data.append({"range": f"{col_letter}{start_row}:{col_letter}{end_row}", "values": out_vals})
+        self.ws.batch_update(data, value_input_option="RAW")
 
         return {"writtenRows": len(out_vals), "outCol": outCol, "outHeader": outHeader}
 
@@ -253,17 +537,21 @@ class SheetOps:
         Return a column for plotting.
         col can be 'A'..'Z' or a header name.
         """
-        c0 = self._col_to_zero_based(col)  # 0-based index into df/headers
-        header = self.headers[c0] if self.headers else col
+        c = (col or "").strip()
+        letter = c.upper() if is_col_letter(c) else self._header_letter(c)
 
-        # Return data rows only (df corresponds to sheet rows starting at row 2)
-        if self.df.empty:
-            values = []
-        else:
-            values = self.df.iloc[:, c0].fillna("").astype(str).tolist()
+        # Only this column, already in column order (majorDimension=COLUMNS).
+        # Any column inside the grid is valid (past the data it is just empty),
+        # so header-less data columns counted by /bounds stay reachable.
+        (data,) = self._get_in_grid([f"{letter}:{letter}"], col, major_dimension="COLUMNS")
+        column = data[0] if data else []
+        header = str(column[0]).strip() if column else ""
+
+        # Return data rows only (sheet rows starting at row 2)
+        values = column[1:]
 
         return {
-            "col": col.upper() if re.fullmatch(r"[A-Za-z]", (col or "").strip()) else col,
+            "col": col.upper() if is_col_letter((col or "").strip()) else col,
             "header": header,
             "values": values,
             "n": len(values),
@@ -274,18 +562,21 @@ class SheetOps:
         if row < 1:
             raise HTTPException(status_code=400, detail="Row must be >= 1.")
 
-        c0 = self._col_to_zero_based(col)  # 0-based in df/headers
-        header = self.headers[c0] if self.headers else ""
-
-        if row == 1:
-            # header row
-            v = header
-        else:
-            r0 = row - 2  # df row index (0-based), because df starts at sheet row 2
-            if r0 < 0 or r0 >= len(self.df):
-                v = ""
-            else:
-                v = self.df.iloc[r0, c0]
+        c = (col or "").strip()
+        letter = c.upper() if is_col_letter(c) else self._header_letter(c)
+
+        # Header + cell in one batchGet; never touches self.values.
+        # Any column inside the grid is valid, same as get_column.
+        try:
+            header_rng, cell_rng = batch_get_values(self.ws, [f"{letter}1", f"{letter}{row}"])
+        except gspread.exceptions.APIError as e:
+            if not exceeds_grid(e):
+                raise
+            # Row past the grid -> blank cell (as before); column past it -> 400
+            (header_rng,) = self._get_in_grid([f"{letter}1"], col)
+            cell_rng = []
+        header = str(first_value(header_rng)).strip()
+        v = header if row == 1 else first_value(cell_rng)
 
         v_str = "" if v is None else str(v)
         return {
@@ -295,11 +586,6 @@ class SheetOps:
             "value": v_str,
         }
 
-# ======================================================
-# Functions below are old funcs that are NOT using numpy or
-# pandas
-# ======================================================
-
 
 # ======================================================
 # ENDPOINT 1: GET /bounds
@@ -308,36 +594,12 @@ class SheetOps:
 # New call: fetch(`http://localhost:8000/bounds?sheet_id=...`)
 # ======================================================
 @app.get("/bounds")
-def get_bounds(sheet_id: str = Query(...)):
-    def _run():
+async def get_bounds(sheet_id: str = Query(...)):
+    def _load():
         ops = SheetOps(sheet_id)
         out = ops.bounds()
         return {"ok": True, **out}
-    return timed(_run)
-
-#def get_bounds(sheet_id: str = Query(...)):
-#    def _run():
-#        sh = get_sheet(sheet_id)
-#        last_row = sh.row_count
-#        all_values = sh.get_all_values()
-
-#        # Find actual last row with data
-#        actual_last_row = 0
-#        for i, row in enumerate(all_values):
-#            if any(cell.strip() for cell in row):
-#                actual_last_row = i + 1
-
-#        headers = all_values[0] if all_values else []
-#        last_col = len(headers)
-
-#        return {
-#            "ok": True,
-#            "lastRow": actual_last_row,
-#            "lastCol": last_col,
-#            "headers": headers
-#        }
-
-#    return timed(_run)
+    return await cached_read("bounds", _bounds_cache, (sheet_id,), _load)
 
 
 # ======================================================
@@ -347,41 +609,16 @@ def get_bounds(sheet_id: str = Query(...)):
 # New call: fetch(`http://localhost:8000/add-cols?sheet_id=...`)
 # ======================================================
 @app.get("/add-cols")
-def add_cols(sheet_id: str = Query(...)):
+async def add_cols(sheet_id: str = Query(...)):
     def _run():
         ops = SheetOps(sheet_id)
         out = ops.add_cols(colA="A", colB="B", outCol="C", outHeader="sum")
+        invalidate_sheet_cache(sheet_id)
         return {"ok": True, "message": f"Wrote {out['writtenRows']} rows"}
-    return timed(_run)
-
-# @app.get("/add-cols")
-# def add_cols(sheet_id: str = Query(...)):
-#     def _run():
-#         sh = get_sheet(sheet_id)
-#         all_values = sh.get_all_values()
-
-#         if len(all_values) < 2:
-#             return {"ok": True, "message": "No data rows"}
-
-#         # Set header for column C
-#         sh.update_cell(1, 3, "sum")
-
-#         # Read col A and B (rows 2 onwards), write sum to col C
-#         out = []
-#         for row in all_values[1:]:  # skip header
-#             a = float(row[0]) if row[0] else 0
-#             b = float(row[1]) if len(row) > 1 and row[1] else 0
-#             out.append([a + b])
-
-#         # Write results to column C starting at row 2
-#         if out:
-#             start_cell = "C2"
-#             end_cell = f"C{1 + len(out)}"
-#             sh.update(f"{start_cell}:{end_cell}", out)
-
-#         return {"ok": True, "message": f"Wrote {len(out)} rows"}
-
-#     return timed(_run)
+    try:
+        return await run_in_threadpool(_run)
+    finally:
+        forget_inflight(sheet_id)
 
 
 # ======================================================
@@ -390,42 +627,13 @@ def add_cols(sheet_id: str = Query(...)):
 # Old call: jsonp({ action: "getColumn", sheetId, col })
 # New call: fetch(`http://localhost:8000/column?sheet_id=...&col=A`)
 # ======================================================
-
 @app.get("/column")
-def get_column(sheet_id: str = Query(...), col: str = Query(...)):
-    def _run():
+async def get_column(sheet_id: str = Query(...), col: str = Query(...)):
+    def _load():
         ops = SheetOps(sheet_id)
         out = ops.get_column(col)
         return {"ok": True, **out}
-    return timed(_run)
-
-# @app.get("/column")
-# def get_column(sheet_id: str = Query(...), col: str = Query(...)):
-#     def _run():
-#         col_upper = col.upper()
-#         col_idx = col_to_index(col_upper)
-#         sh = get_sheet(sheet_id)
-#         all_values = sh.get_all_values()
-
-#         if not all_values:
-#             return {"ok": True, "col": col_upper, "header": col_upper, "values": [], "n": 0}
-
-#         header = all_values[0][col_idx - 1] if len(all_values[0]) >= col_idx else col_upper
-
-#         # Data rows only (skip header row 1)
-#         values = []
-#         for row in all_values[1:]:
-#             values.append(row[col_idx - 1] if len(row) >= col_idx else "")
-
-#         return {
-#             "ok": True,
-#             "col": col_upper,
-#             "header": header,
-#             "values": values,
-#             "n": len(values)
-#         }
-
-#     return timed(_run)
+    return await cached_read("column", _column_cache, (sheet_id, col), _load)
 
 
 # ======================================================
@@ -434,32 +642,8 @@ def get_column(sheet_id: str = Query(...), col: str = Query(...)):
 # Old call: jsonp({ action: "getCell", sheetId, row, col })
 # New call: fetch(`http://localhost:8000/cell?sheet_id=...&row=2&col=A`)
 # ======================================================
-# @app.get("/cell")
-# def get_cell(sheet_id: str = Query(...), row: int = Query(...), col: str = Query(...)):
-#     def _run():
-#         col_upper = col.upper()
-#         col_idx = col_to_index(col_upper)
-#         sh = get_sheet(sheet_id)
-
-#         # Get header (row 1 of this column)
-#         feature_name = sh.cell(1, col_idx).value or ""
-
-#         # Get the actual cell
-#         cell_value = sh.cell(row, col_idx).value
-
-#         return {
-#             "ok": True,
-#             "row": row,
-#             "col": col_upper,
-#             "featureName": feature_name or "(no header)",
-#             "value": cell_value if cell_value is not None else "",
-#             "type": classify(cell_value)
-#         }
-
-#     return timed(_run)
-
 @app.get("/cell")
-def get_cell(sheet_id: str = Query(...), row: int = Query(...), col: str = Query(...)):
+async def get_cell(sheet_id: str = Query(...), row: int = Query(...), col: str = Query(...)):
     def _run():
         ops = SheetOps(sheet_id)
         cell = ops.get_cell_value(row=row, col=col)  # col can be "A" or header name
@@ -473,7 +657,9 @@ def get_cell(sheet_id: str = Query(...), row: int = Query(...), col: str = Query
             "value": cell["value"],
             "type": classify(cell["value"]),
         }
-    return timed(_run)
+    return await coalesced(("cell", sheet_id, row, col), _run)
+
+
 # ======================================================
 # ENDPOINT 5: GET /set-cell
 # Equivalent to handleSetCell_() in GAS
@@ -482,31 +668,35 @@ def get_cell(sheet_id: str = Query(...), row: int = Query(...), col: str = Query
 # This API is not using pandas due to its feature
 # ======================================================
 @app.get("/set-cell")
-def set_cell(
+async def set_cell(
     sheet_id: str = Query(...),
     row: int = Query(...),
     col: str = Query(...),
     value: Optional[str] = Query(default="")
 ):
     def _run():
+        col_to_index(col)  # validate A-Z (on the raw input)
         col_upper = col.upper()
-        col_idx = col_to_index(col_upper)
         sh = get_sheet(sheet_id)
 
+        # RAW: stored as-is, no server-side formula/format parsing
         parsed = smart_parse(value or "")
-        sh.update_cell(row, col_idx, parsed)
-
-        written = sh.cell(row, col_idx).value
+        sh.update(values=[[parsed]], range_name=f"{col_upper}{row}", value_input_option="RAW")
+        invalidate_sheet_cache(sheet_id)
 
+        # No read-back: with RAW the stored value is exactly `parsed`
         return {
             "ok": True,
             "row": row,
             "col": col_upper,
-            "writtenValue": written if written is not None else "",
-            "writtenType": classify(written)
+            "writtenValue": parsed,
+            "writtenType": classify(parsed)
         }
 
-    return timed(_run)
+    try:
+        return await run_in_threadpool(_run)
+    finally:
+        forget_inflight(sheet_id)
 
 
 # ======================================================
@@ -44,7 +44,11 @@ async function apiFetch(endpoint, params) {
   const url = `${API_URL}/${endpoint}?${q.toString()}`;
   const res = await fetch(url);
   if (!res.ok) throw new Error(`HTTP error: ${res.status}`);
-  return res.json();
+  const data = await res.json();
+  // Backend time now comes in a response header instead of the JSON body
+  const ms = res.headers.get("X-Response-Time-ms");
+  if (ms !== null && data && typeof data === "object") data.ms = Number(ms);
+  return data;
 }
 
 // Initialize dropdown